@@ -27,6 +27,7 @@ LOGGER = logging.getLogger(__name__)
 class AttachData(BaseModel):
     class Config:
         allow_population_by_field_name = True
+        copy_on_model_validation = "none"
 
     base64: Annotated[Optional[str], Field(description="Base64-encoded data")] = None
     json_: Annotated[
@@ -55,6 +56,9 @@ class Attach(BaseModel):
 
     class Config:
         allow_population_by_field_name = True
+        # Attachments are built fresh for each message; don't copy them again
+        # when they are validated as fields of the enclosing message
+        copy_on_model_validation = "none"
 
     @classmethod
     def data_base64(
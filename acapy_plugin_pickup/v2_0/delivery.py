@@ -1,8 +1,10 @@
 """Delivery Request and wrapper message for Pickup Protocol."""
 
+from itertools import islice
 import json
 import logging
-from typing import List, Optional, Sequence, Set, cast
+from typing import List, Optional, Sequence, Set, Tuple, cast
+from weakref import WeakKeyDictionary
 
 from aries_cloudagent.messaging.request_context import RequestContext
 from aries_cloudagent.messaging.responder import BaseResponder
@@ -21,6 +23,10 @@ from .status import Status
 LOGGER = logging.getLogger(__name__)
 PROTOCOL = "https://didcomm.org/messagepickup/2.0"
 
+_message_tags: "WeakKeyDictionary[OutboundMessage, Tuple[int, str]]" = (
+    WeakKeyDictionary()
+)
+
 
 class DeliveryRequest(AgentMessage):
     """DeliveryRequest message."""
@@ -33,7 +39,9 @@ class DeliveryRequest(AgentMessage):
     @staticmethod
     def determine_session(manager: InboundTransportManager, key: str):
         """Determine the session associated with the given key."""
-        for session in manager.sessions.values():
+        # Sessions are kept in creation order and the requesting session is
+        # almost always the most recently opened, so search newest first
+        for session in reversed(manager.sessions.values()):
             session = cast(InboundSession, session)
             if key in session.reply_verkeys:
                 return session
@@ -54,22 +62,16 @@ class DeliveryRequest(AgentMessage):
         key = context.message_receipt.sender_verkey
         message_attachments = []
 
-        if queue.has_message_for_key(key):
+        # A non-positive limit has always delivered a single message
+        msgs = get_messages_for_key(queue, key, max(self.limit, 1))
+        if msgs:
             session = self.determine_session(manager, key)
             if session is None:
                 LOGGER.warning("No session available to deliver messages as requested")
                 return
 
-            returned_count = 0
             async with context.session() as profile_session:
-                for msg in get_messages_for_key(queue, key):
-                    recipient_key = (
-                        msg.target_list[0].recipient_keys
-                        or context.message_receipt.recipient_verkey
-                    )
-                    routing_keys = msg.target_list[0].routing_keys or []
-                    sender_key = msg.target_list[0].sender_key or key
-
+                for msg in msgs:
                     # This scenario is rare; a message will almost always have an
                     # encrypted payload. The only time it won't is if we're sending a
                     # message from the mediator itself, rather than forwarding a message
@@ -77,6 +79,13 @@ class DeliveryRequest(AgentMessage):
                     # TODO: update ACA-Py to store all messages with an
                     # encrypted payload
                     if not msg.enc_payload:
+                        target = msg.target_list[0]
+                        recipient_key = (
+                            target.recipient_keys
+                            or context.message_receipt.recipient_verkey
+                        )
+                        routing_keys = target.routing_keys or []
+                        sender_key = target.sender_key or key
                         msg.enc_payload = await wire_format.encode_message(
                             profile_session,
                             msg.payload,
@@ -86,13 +95,9 @@ class DeliveryRequest(AgentMessage):
                         )
 
                     attached_msg = Attach.data_base64(
-                        ident=json.loads(msg.enc_payload)["tag"], value=msg.enc_payload
+                        ident=message_tag(msg), value=msg.enc_payload
                     )
                     message_attachments.append(attached_msg)
-                    returned_count += 1
-
-                    if returned_count >= self.limit:
-                        break
 
             response = Delivery(message_attachments=message_attachments)
         else:
@@ -135,50 +140,81 @@ class MessagesReceived(AgentMessage):
         queue = manager.undelivered_queue
         key = context.message_receipt.sender_verkey
 
-        if queue.has_message_for_key(key):
-            remove_message_by_tag_list(queue, key, self.message_id_list)
+        count = remove_message_by_tag_list(queue, key, self.message_id_list)
 
-        response = Status(message_count=queue.message_count_for_key(key))
+        response = Status(message_count=count)
         response.assign_thread_from(self)
         await responder.send_reply(response)
 
 
-def remove_message_by_tag(queue: DeliveryQueue, recipient_key: str, tag: str):
+def remove_message_by_tag(queue: DeliveryQueue, recipient_key: str, tag: str) -> int:
     """Remove a message from a recipient's queue by tag.
 
     Tag corresponds to a value in the encrypted payload which is unique for
-    each message.
+    each message. Returns the number of messages remaining in the queue.
     """
     return remove_message_by_tag_list(queue, recipient_key, {tag})
 
 
 def remove_message_by_tag_list(
     queue: DeliveryQueue, recipient_key: str, tag_list: Set[str]
-):
-    # For debugging, logs the contents of each message as it's retrieved from the queue
-    for i in queue.queue_by_key[recipient_key]:
-        LOGGER.debug("%s", i.msg)
+) -> int:
+    """Remove messages from a recipient's queue by tag.
 
+    Returns the number of messages remaining in the queue.
+    """
     if recipient_key not in queue.queue_by_key:
-        return
+        return 0
+
+    # For debugging, logs the contents of each message as it's retrieved from the queue
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        for i in queue.queue_by_key[recipient_key]:
+            LOGGER.debug("%s", i.msg)
+
     LOGGER.debug(
         "Removing messages with tags from queue: %s", queue.queue_by_key[recipient_key]
     )
-    queue.queue_by_key[recipient_key][:] = [
-        queued_message
-        for queued_message in queue.queue_by_key[recipient_key]
-        if queued_message.msg.enc_payload is None
-        or json.loads(queued_message.msg.enc_payload)["tag"] not in tag_list
-    ]
-
-
-def get_messages_for_key(queue: DeliveryQueue, key: str) -> List[OutboundMessage]:
+    queued = queue.queue_by_key[recipient_key]
+    if tag_list:
+        queued[:] = [
+            queued_message
+            for queued_message in queued
+            if queued_message.msg.enc_payload is None
+            or message_tag(queued_message.msg) not in tag_list
+        ]
+    return len(queued)
+
+
+def message_tag(msg: OutboundMessage) -> str:
+    """Return the tag of a message's encrypted payload.
+
+    The tag is used as the attachment id. Queued messages are inspected on every
+    delivery request and acknowledgement, so parsed tags are cached for as long
+    as the message itself is alive. Only the identity of the parsed payload is
+    kept alongside the tag so a replaced payload is not held in memory.
+    """
+    payload_id = id(msg.enc_payload)
+    cached = _message_tags.get(msg)
+    if cached and cached[0] == payload_id:
+        return cached[1]
+    tag = json.loads(msg.enc_payload)["tag"]
+    _message_tags[msg] = (payload_id, tag)
+    return tag
+
+
+def get_messages_for_key(
+    queue: DeliveryQueue, key: str, limit: Optional[int] = None
+) -> List[OutboundMessage]:
     """
     Return messages for a given key from the queue without removing them.
 
+    Only the first `limit` messages are visited so retrieval cost is bounded
+    by the requested count rather than the depth of the queue.
+
     Args:
         key: The key to use for lookup
+        limit: Optional maximum number of messages to return
     """
     if key in queue.queue_by_key:
-        return [queued.msg for queued in queue.queue_by_key[key]]
+        return [queued.msg for queued in islice(queue.queue_by_key[key], limit)]
     return []
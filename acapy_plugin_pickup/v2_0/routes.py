@@ -1,9 +1,9 @@
 import logging
-import re
 
 from aries_cloudagent.core.event_bus import Event, EventBus
 from aries_cloudagent.core.profile import Profile
 from aries_cloudagent.core.protocol_registry import ProtocolRegistry
+from aries_cloudagent.core.util import STARTUP_EVENT_PATTERN
 
 LOGGER = logging.getLogger(__name__)
 
@@ -12,10 +12,7 @@ WEBHOOK_TOPIC = "acapy::webhook::questionanswer"
 
 def register_events(event_bus: EventBus):
     """Register to handle events."""
-    event_bus.subscribe(
-        re.compile("^acapy::core::startup"),
-        on_startup,
-    )
+    event_bus.subscribe(STARTUP_EVENT_PATTERN, on_startup)
 
 
 async def on_startup(profile: Profile, event: Event):
@@ -0,0 +1,116 @@
+"""Test delivery helpers."""
+
+from collections import OrderedDict
+import json
+from unittest import mock
+
+import pytest
+from aries_cloudagent.transport.inbound.delivery_queue import DeliveryQueue
+from aries_cloudagent.transport.inbound.manager import InboundTransportManager
+from aries_cloudagent.transport.inbound.session import InboundSession
+from aries_cloudagent.transport.outbound.message import OutboundMessage
+
+from acapy_plugin_pickup.v2_0.delivery import (
+    Delivery,
+    DeliveryRequest,
+    get_messages_for_key,
+    message_tag,
+    remove_message_by_tag_list,
+)
+
+KEY = "recipient-key"
+
+
+def outbound(tag: str) -> OutboundMessage:
+    return OutboundMessage(
+        payload="",
+        enc_payload=json.dumps({"protected": "", "tag": tag}),
+        reply_to_verkey=KEY,
+    )
+
+
+@pytest.fixture
+def queue():
+    queue = DeliveryQueue()
+    for tag in ("one", "two", "three"):
+        queue.add_message(outbound(tag))
+    yield queue
+
+
+def test_get_messages_for_key(queue: DeliveryQueue):
+    assert len(get_messages_for_key(queue, KEY)) == 3
+    assert get_messages_for_key(queue, "unknown") == []
+
+
+def test_get_messages_for_key_limit(queue: DeliveryQueue):
+    msgs = get_messages_for_key(queue, KEY, 2)
+    assert [json.loads(msg.enc_payload)["tag"] for msg in msgs] == ["one", "two"]
+    assert queue.message_count_for_key(KEY) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [0, -1])
+async def test_delivery_request_non_positive_limit(queue: DeliveryQueue, limit: int):
+    manager = mock.MagicMock(InboundTransportManager, undelivered_queue=queue)
+    manager.sessions = OrderedDict(
+        session=mock.MagicMock(InboundSession, reply_verkeys={KEY})
+    )
+    context = mock.MagicMock()
+    context.inject.side_effect = lambda cls: (
+        manager if cls is InboundTransportManager else mock.MagicMock()
+    )
+    context.message_receipt.sender_verkey = KEY
+    responder = mock.MagicMock()
+    responder.send_reply = mock.AsyncMock()
+
+    request = DeliveryRequest.deserialize(
+        {"limit": limit, "~transport": {"return_route": "all"}}
+    )
+    await request.handle(context, responder)
+
+    (response,) = responder.send_reply.call_args.args
+    assert isinstance(response, Delivery)
+    assert [attach.ident for attach in response.message_attachments] == ["one"]
+
+
+def test_message_tag():
+    msg = outbound("tag")
+    assert message_tag(msg) == "tag"
+    assert message_tag(msg) == "tag"
+    msg.enc_payload = json.dumps({"protected": "", "tag": "other"}).encode()
+    assert message_tag(msg) == "other"
+
+
+def test_remove_message_by_tag_list(queue: DeliveryQueue):
+    assert remove_message_by_tag_list(queue, KEY, {"one", "three", "missing"}) == 1
+    assert [message_tag(msg) for msg in get_messages_for_key(queue, KEY)] == ["two"]
+    assert remove_message_by_tag_list(queue, KEY, set()) == 1
+    assert remove_message_by_tag_list(queue, "unknown", {"two"}) == 0
+
+
+def test_remove_message_by_tag_list_skips_untagged(queue: DeliveryQueue):
+    queue.queue_by_key[KEY][1].msg.enc_payload = None
+    assert remove_message_by_tag_list(queue, KEY, {"one", "three"}) == 1
+    assert get_messages_for_key(queue, KEY)[0].enc_payload is None
+
+
+def test_remove_message_by_tag_list_duplicates(queue: DeliveryQueue):
+    queue.add_message(outbound("one"))
+    assert remove_message_by_tag_list(queue, KEY, {"one"}) == 2
+    assert [message_tag(msg) for msg in get_messages_for_key(queue, KEY)] == [
+        "two",
+        "three",
+    ]
+
+
+def test_determine_session():
+    manager = mock.MagicMock(InboundTransportManager)
+    manager.sessions = OrderedDict()
+    for ident, verkeys in (("old", [KEY]), ("other", ["other"]), ("new", [KEY])):
+        manager.sessions[ident] = mock.MagicMock(
+            InboundSession, session_id=ident, reply_verkeys=set(verkeys)
+        )
+
+    assert DeliveryRequest.determine_session(manager, KEY).session_id == "new"
+    assert DeliveryRequest.determine_session(manager, "other").session_id == "other"
+    assert DeliveryRequest.determine_session(manager, "unknown") is None
@@ -2,7 +2,10 @@
 
 import pytest
 import json
+from base64 import b64decode
 from datetime import datetime
+from acapy_plugin_pickup.acapy import Attach
+from acapy_plugin_pickup.v2_0.delivery import Delivery
 from acapy_plugin_pickup.v2_0.status import Status
 
 
@@ -26,3 +29,21 @@ def test_create_status():
     serialized = json.loads(status.json())
     assert serialized["newest_time"]
     assert serialized["newest_time"] == now.isoformat()
+
+
+def test_attach_data_base64():
+    value = {"tag": "test"}
+    for attach in (
+        Attach.data_base64(value, ident="test"),
+        Attach.data_base64(json.dumps(value), ident="test"),
+        Attach.data_base64(json.dumps(value).encode(), ident="test"),
+    ):
+        assert attach.ident == "test"
+        assert json.loads(b64decode(attach.data.base64)) == value
+
+
+def test_delivery_does_not_copy_attachments():
+    attach = Attach.data_base64(b"{}", ident="test")
+    delivery = Delivery(message_attachments=[attach])
+    assert delivery.message_attachments[0] is attach
+    assert delivery.serialize()["~attach"][0]["@id"] == "test"